@@ -0,0 +1,141 @@
+import hashlib
+import hmac
+import threading
+import time
+from typing import Optional
+
+from fastapi import Header, HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from .config import settings
+from .db import SessionLocal
+from .models import Admin
+
+
+# ==============================
+# Подписанный токен админа
+# ==============================
+# Формат: "<telegram_id>.<expires_ts>.<hmac_sha256_hex>", подпись — HMAC(ADMIN_TOKEN_SECRET, "<telegram_id>.<expires_ts>").
+# Бот подписывает токен тем же секретом (см. bot.py), backend проверяет его без обращения к БД.
+# Срок жизни ограничивает backend: токен с expires_ts дальше now + ADMIN_TOKEN_TTL_SECONDS отклоняется.
+
+_CLOCK_SKEW_SECONDS = 30
+
+def _sign(message: str) -> str:
+    return hmac.new(settings.ADMIN_TOKEN_SECRET.encode("utf-8"), message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def create_admin_token(telegram_id: int, ttl: Optional[int] = None) -> str:
+    if ttl is None:
+        ttl = settings.ADMIN_TOKEN_TTL_SECONDS
+    expires_ts = int(time.time()) + ttl
+    message = f"{telegram_id}.{expires_ts}"
+    return f"{message}.{_sign(message)}"
+
+
+def verify_admin_token(token: str) -> Optional[int]:
+    """Возвращает telegram_id, если подпись верна, срок не истёк и не длиннее TTL, иначе None."""
+    try:
+        telegram_id, expires_ts, signature = token.split(".")
+        telegram_id, expires_ts = int(telegram_id), int(expires_ts)
+    except ValueError:
+        return None
+    # байты, а не str: compare_digest падает с TypeError на не-ASCII строках из заголовка
+    expected = _sign(f"{telegram_id}.{expires_ts}").encode("utf-8")
+    if not hmac.compare_digest(signature.encode("utf-8"), expected):
+        return None
+    now = time.time()
+    if expires_ts < now or expires_ts > now + settings.ADMIN_TOKEN_TTL_SECONDS + _CLOCK_SKEW_SECONDS:
+        return None
+    return telegram_id
+
+
+# ==============================
+# Кэш прав админов
+# ==============================
+# Admin.permissions — список через запятую ("products,reports"), "*" — все права.
+# Поколения инвалидаций: загрузка из БД не кладёт результат в кэш, если за время
+# загрузки был сброс этого админа (или всего кэша) — иначе сброс потерялся бы на TTL.
+
+_permissions_cache = {}
+_permissions_generation = {}
+_global_generation = 0
+_permissions_lock = threading.Lock()
+
+
+def _load_permissions(telegram_id: int):
+    session = SessionLocal()
+    try:
+        admin = session.query(Admin).filter(Admin.telegram_id == telegram_id).first()
+        if not admin:
+            return None
+        return frozenset(p.strip() for p in (admin.permissions or "").split(",") if p.strip())
+    finally:
+        session.close()
+
+
+def get_admin_permissions(telegram_id: int):
+    """Права админа из in-process кэша (TTL), при промахе — из БД. None — админа нет."""
+    now = time.monotonic()
+    with _permissions_lock:
+        cached = _permissions_cache.get(telegram_id)
+        generation = (_global_generation, _permissions_generation.get(telegram_id, 0))
+    if cached and cached[1] > now:
+        return cached[0]
+
+    permissions = _load_permissions(telegram_id)
+    with _permissions_lock:
+        if generation == (_global_generation, _permissions_generation.get(telegram_id, 0)):
+            _permissions_cache[telegram_id] = (permissions, now + settings.ADMIN_PERMISSIONS_CACHE_TTL)
+    return permissions
+
+
+def invalidate_admin_permissions(telegram_id: Optional[int] = None):
+    """Сбросить кэш прав одного админа (или всех) — вызывать после изменения Admin.permissions."""
+    global _global_generation
+    with _permissions_lock:
+        if telegram_id is None:
+            _global_generation += 1
+            _permissions_cache.clear()
+        else:
+            _permissions_generation[telegram_id] = _permissions_generation.get(telegram_id, 0) + 1
+            _permissions_cache.pop(telegram_id, None)
+
+
+def ensure_root_admin(session, telegram_id: int):
+    """
+    Создаёт админа ADMIN_CHAT_ID с правами "*", если его ещё нет (существующие права не трогает).
+    Несколько воркеров на старте могут вставлять одновременно — проигравший получает IntegrityError и идёт дальше.
+    """
+    if session.query(Admin).filter(Admin.telegram_id == telegram_id).first():
+        return
+    session.add(Admin(telegram_id=telegram_id, name="root", permissions="*"))
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        return
+    invalidate_admin_permissions(telegram_id)
+
+
+# ==============================
+# FastAPI dependency
+# ==============================
+def require_admin(permission: str):
+    """
+    Dependency для админских эндпоинтов:
+    @app.post(..., dependencies=[Depends(require_admin("products"))])
+    Токен передаётся в заголовке Authorization: Bearer <token>.
+    """
+    def dependency(authorization: Optional[str] = Header(None)) -> int:
+        scheme, _, token = (authorization or "").partition(" ")
+        telegram_id = verify_admin_token(token) if scheme.lower() == "bearer" else None
+        if telegram_id is None:
+            raise HTTPException(status_code=401, detail="Invalid or expired admin token")
+
+        permissions = get_admin_permissions(telegram_id)
+        if permissions is None or not ("*" in permissions or permission in permissions):
+            raise HTTPException(status_code=403, detail="Permission denied")
+        return telegram_id
+
+    return dependency
@@ -1,14 +1,27 @@
-from pydantic import BaseSettings
+from typing import Optional
+
+from pydantic import BaseSettings, validator
+
+ADMIN_TOKEN_SECRET_MIN_LENGTH = 32
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: str = ""  # через запятую; пусто — все запросы идут в primary
+    DATABASE_REPLICA_RETRY_SECONDS: int = 30
+    DATABASE_REPLICA_CONNECT_TIMEOUT: int = 3  # секунды
     ADMIN_CHAT_ID: int
     TELEGRAM_BOT_TOKEN: str
     BUYER_BOT_TOKEN: str
 
+    ADMIN_TOKEN_SECRET: str                 # общий секрет с ботом; только из окружения деплоя, не из .env в git
+    ADMIN_TOKEN_TTL_SECONDS: int = 300
+    ADMIN_PERMISSIONS_CACHE_TTL: int = 60
+
     TINKOFF_TERMINAL_KEY: str
     TINKOFF_PASSWORD: str
     TINKOFF_API_URL: str
+    TINKOFF_TAXATION: Optional[str] = None  # СНО для чека (osn, usn_income, ...); не задано — Init без Receipt
+    TINKOFF_TAX: str = "none"  # ставка НДС позиций чека (none, vat0, vat10, vat20, ...)
 
     DADATA_API_KEY: str
     BASE_URL: str
@@ -20,6 +33,12 @@ class Settings(BaseSettings):
 
     FRONTEND_RETURN_URL: str
 
+    @validator("ADMIN_TOKEN_SECRET")
+    def _admin_token_secret_strong(cls, value):
+        if len(value) < ADMIN_TOKEN_SECRET_MIN_LENGTH:
+            raise ValueError(f"ADMIN_TOKEN_SECRET must be at least {ADMIN_TOKEN_SECRET_MIN_LENGTH} characters")
+        return value
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,46 +1,87 @@
 # app/crud.py
 
-from datetime import datetime, date
+from datetime import datetime, timezone
 from sqlalchemy.exc import IntegrityError
-from .models import Order, Product
+from .models import Order, OrderItem, Product
 from .tinkoff_client import create_tinkoff_payment
 from .config import settings
 
 
+class ProductNotFound(Exception):
+    """Товара из заказа нет в БД."""
+
+
 def _generate_order_id(session):
-    today = date.today().strftime("%Y%m%d")
+    now = datetime.now(timezone.utc)
+    today = now.strftime("%Y%m%d")
     count = session.query(Order).filter(
-        Order.created_at >= datetime.combine(date.today(), datetime.min.time())
+        Order.created_at >= now.replace(hour=0, minute=0, second=0, microsecond=0)
     ).count()
     seq = count + 1
     return f"{today}_{seq:03d}"
 
 
+def build_order_items(session, cart_items):
+    """
+    Собирает позиции заказа за один запрос к products и один проход по корзине.
+    cart_items: список OrderItemIn (product_id, quantity)
+    Возвращает: (order_items, base_amount_cents, agent_fee_cents)
+    """
+    product_ids = {item.product_id for item in cart_items}
+    products = {
+        p.id: p for p in session.query(Product).filter(Product.id.in_(product_ids)).all()
+    }
+    if len(products) != len(product_ids):
+        raise ProductNotFound("Product not found")
+
+    order_items = []
+    base_amount_cents = 0
+    agent_fee_cents = 0
+    for item in cart_items:
+        product = products[item.product_id]
+        item_base_cents = product.base_price_cents * item.quantity
+        item_fee_cents = int(item_base_cents * product.agent_percent / 100)
+        base_amount_cents += item_base_cents
+        agent_fee_cents += item_fee_cents
+        order_items.append(OrderItem(
+            product_id=product.id,
+            title=product.title,
+            quantity=item.quantity,
+            price_cents=product.base_price_cents,
+            agent_fee_cents=item_fee_cents,
+        ))
+    return order_items, base_amount_cents, agent_fee_cents
+
+
+def receipt_items(order):
+    """Позиции чека для Tinkoff Init: товары + агентское вознаграждение отдельной строкой."""
+    items = [
+        {"name": item.title, "price_cents": item.price_cents, "quantity": item.quantity}
+        for item in order.items
+    ]
+    if order.agent_fee_cents:
+        items.append({"name": "Агентское вознаграждение", "price_cents": order.agent_fee_cents, "quantity": 1})
+    return items
+
+
 def create_order_and_payment(session, payload):
     """
     Создаёт заказ в БД + инициализирует оплату в Tinkoff Acquiring.
     Возвращает: (order_id_str, payment_url)
     """
 
-    # -- 1. Ищем продукт --
-    product = session.query(Product).filter(Product.id == payload.product_id).first()
-    if not product:
-        raise ValueError("Product not found")
+    # -- 1. Ищем продукты и рассчитываем стоимость --
+    order_items, base_amount_cents, agent_fee_cents = build_order_items(session, payload.cart_items())
+    total_amount_cents = base_amount_cents + agent_fee_cents
 
     # -- 2. Генерируем order_id --
     order_id_str = _generate_order_id(session)
 
-    # -- 3. Рассчитываем стоимость --
-    quantity = payload.quantity
-    base_amount_cents = product.base_price_cents * quantity
-    agent_fee_cents = int(base_amount_cents * product.agent_percent / 100)
-    total_amount_cents = base_amount_cents + agent_fee_cents
-
-    # -- 4. Создаём заказ локально --
+    # -- 3. Создаём заказ локально (вместе с позициями) --
     order = Order(
         order_id_str=order_id_str,
-        product_id=product.id,
-        quantity=quantity,
+        product_id=order_items[0].product_id,
+        quantity=sum(item.quantity for item in order_items),
         total_amount_cents=total_amount_cents,
         agent_fee_cents=agent_fee_cents,
         customer_fullname=payload.fullname,
@@ -50,18 +91,20 @@ def create_order_and_payment(session, payload):
         customer_address=payload.address,
         comment=payload.comment,
         status="created",
+        items=order_items,
     )
     session.add(order)
     session.commit()
     session.refresh(order)
 
-    # -- 5. Запрос в Tinkoff Init --
+    # -- 4. Запрос в Tinkoff Init (один на всю корзину) --
     try:
         payment = create_tinkoff_payment(
             amount_cents=total_amount_cents,
             order_id=order.order_id_str,
             email=order.customer_email or "",
             phone=order.customer_phone or "",
+            receipt_items=receipt_items(order),
         )
     except Exception as e:
         order.status = "error"
@@ -0,0 +1,102 @@
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# ==========================
+# PRIMARY
+# ==========================
+DATABASE_URL = settings.DATABASE_URL
+engine = create_engine(DATABASE_URL, future=True)
+SessionLocal = sessionmaker(bind=engine)
+
+
+# ==========================
+# REPLICAS
+# ==========================
+def _connect_args(url, connect_timeout: int) -> dict:
+    # connect_timeout понимают драйверы PostgreSQL; у sqlite сетевого подключения нет
+    if make_url(url).get_backend_name() == "postgresql":
+        return {"connect_timeout": connect_timeout}
+    return {}
+
+
+class ReplicaRouter:
+    """
+    Round-robin по read-репликам.
+    Реплика, на которой упал запрос, выводится из ротации на retry_after секунд,
+    после чего снова пробуется (pool_pre_ping проверяет соединение при выдаче из пула).
+    connect_timeout ограничивает подключение к зависшей реплике, чтобы она быстро падала в mark_down.
+    """
+
+    def __init__(self, urls, retry_after: int = 30, connect_timeout: int = 3):
+        self.engines = [
+            create_engine(url, future=True, pool_pre_ping=True, connect_args=_connect_args(url, connect_timeout))
+            for url in urls
+        ]
+        self.retry_after = retry_after
+        self._down_until = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def pick(self):
+        """Следующая живая реплика или None, если живых нет."""
+        if not self.engines:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._counter)
+            for i in range(len(self.engines)):
+                replica = self.engines[(start + i) % len(self.engines)]
+                if self._down_until.get(replica, 0) <= now:
+                    return replica
+        return None
+
+    def mark_down(self, replica):
+        with self._lock:
+            self._down_until[replica] = time.monotonic() + self.retry_after
+        logger.warning("Replica %s marked down for %ss", replica.url, self.retry_after)
+
+
+REPLICA_URLS = [u.strip() for u in settings.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+replica_router = ReplicaRouter(
+    REPLICA_URLS,
+    retry_after=settings.DATABASE_REPLICA_RETRY_SECONDS,
+    connect_timeout=settings.DATABASE_REPLICA_CONNECT_TIMEOUT,
+)
+ReplicaSessionLocal = sessionmaker()
+
+
+def run_read(fn, primary: bool = False, fresh_on_miss: bool = False):
+    """
+    Выполняет read-only функцию fn(session) на реплике, при недоступности — на primary.
+    primary: принудительно читать с primary (read-your-writes).
+    fresh_on_miss: если реплика вернула None (например, запись ещё не доехала
+    из-за лага репликации), повторить чтение на primary.
+    """
+    replica = None if primary else replica_router.pick()
+    if replica is not None:
+        session = ReplicaSessionLocal(bind=replica)
+        try:
+            result = fn(session)
+            if result is not None or not fresh_on_miss:
+                return result
+        except OperationalError:
+            replica_router.mark_down(replica)
+        finally:
+            session.close()
+
+    session = SessionLocal()
+    try:
+        return fn(session)
+    finally:
+        session.close()
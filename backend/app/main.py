@@ -1,23 +1,26 @@
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse, JSONResponse
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from pydantic import BaseModel
 from .config import settings
+from .db import engine, SessionLocal, run_read
+from .auth import ensure_root_admin, require_admin
 from .models import Base, Product, Order
 from .schemas import CreateOrderIn, CreateOrderOut
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import os
-from datetime import datetime, timezone
-from .tinkoff_client import create_tinkoff_payment, check_order, generate_webhook_token
+from datetime import datetime
+from .crud import ProductNotFound, create_order_and_payment
+from .tinkoff_client import check_order, generate_webhook_token
 
 # DATABASE
-DATABASE_URL = settings.DATABASE_URL
-engine = create_engine(DATABASE_URL, future=True)
-SessionLocal = sessionmaker(bind=engine)
 Base.metadata.create_all(bind=engine)
+_session = SessionLocal()
+try:
+    ensure_root_admin(_session, settings.ADMIN_CHAT_ID)  # иначе /api/products/create отвечает 403 всем
+finally:
+    _session.close()
 
 # FASTAPI
 app = FastAPI(title="Payment backend")
@@ -35,7 +38,7 @@ class CreateProductIn(BaseModel):
 class CreateProductOut(BaseModel):
     product_id: int
 
-@app.post("/api/products/create", response_model=CreateProductOut)
+@app.post("/api/products/create", response_model=CreateProductOut, dependencies=[Depends(require_admin("products"))])
 def create_product(payload: CreateProductIn):
     session = SessionLocal()
     try:
@@ -58,52 +61,12 @@ def create_product(payload: CreateProductIn):
 def api_create_order(payload: CreateOrderIn):
     session = SessionLocal()
     try:
-        product = session.query(Product).filter(Product.id == payload.product_id).first()
-        if not product:
+        try:
+            order_id_str, payment_url = create_order_and_payment(session, payload)
+        except ProductNotFound:
             raise HTTPException(status_code=404, detail="Product not found")
 
-        today_str = datetime.now(timezone.utc).strftime("%Y%m%d")
-        seq = session.query(Order).filter(
-            Order.created_at >= datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        ).count() + 1
-        order_id_str = f"{today_str}_{seq:03d}"
-
-        quantity = getattr(payload, "quantity", 1)
-        base_amount = product.base_price_cents * quantity
-        agent_fee = int(base_amount * product.agent_percent / 100)
-        total_cents = base_amount + agent_fee
-
-        order = Order(
-            order_id_str=order_id_str,
-            product_id=product.id,
-            quantity=quantity,
-            total_amount_cents=total_cents,
-            agent_fee_cents=agent_fee,
-            customer_fullname=payload.fullname,
-            customer_phone=payload.phone,
-            customer_email=payload.email,
-            customer_city=payload.city,
-            customer_address=payload.address,
-            comment=payload.comment,
-            status="created",
-        )
-        session.add(order)
-        session.commit()
-        session.refresh(order)
-
-        # Tinkoff Init
-        tinkoff_resp = create_tinkoff_payment(
-            amount_cents=order.total_amount_cents,
-            order_id=order.order_id_str,
-            email=order.customer_email,
-            phone=order.customer_phone
-        )
-
-        order.yookassa_payment_id = str(tinkoff_resp['payment_id'])
-        order.status = "pending"
-        session.commit()
-
-        return CreateOrderOut(order_id=order.order_id_str, confirmation_url=tinkoff_resp['payment_url'])
+        return CreateOrderOut(order_id=order_id_str, confirmation_url=payment_url)
     finally:
         session.close()
 
@@ -112,9 +75,12 @@ def api_create_order(payload: CreateOrderIn):
 # ==========================
 @app.get("/pay/{product_id}", response_class=HTMLResponse)
 def pay_page(request: Request, product_id: int):
-    session = SessionLocal()
-    product = session.query(Product).filter(Product.id == product_id).first()
-    session.close()
+    # только чтение — идёт на реплику; свежесозданный товар может ещё не доехать до неё,
+    # поэтому при промахе перечитываем с primary
+    product = run_read(
+        lambda session: session.query(Product).filter(Product.id == product_id).first(),
+        fresh_on_miss=True,
+    )
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
@@ -25,8 +25,8 @@ class Order(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     order_id_str = Column(String(32), unique=True, nullable=False, index=True)  # формата YYYYMMDD_### 
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
-    quantity = Column(Integer, default=1)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)  # для корзины — первая позиция
+    quantity = Column(Integer, default=1)  # для корзины — суммарное количество
     total_amount_cents = Column(Integer, nullable=False, default=0)  # сумма в копейках
     agent_fee_cents = Column(Integer, nullable=False, default=0)     # агентское вознаграждение в копейках
 
@@ -46,10 +46,28 @@ class Order(Base):
 
     # relationship to product
     product = relationship("Product", lazy="joined")
+    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Order id={self.id} order_id={self.order_id_str!r} status={self.status}>"
 
+class OrderItem(Base):
+    __tablename__ = "order_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    title = Column(String(256), nullable=False)                    # название на момент заказа
+    quantity = Column(Integer, nullable=False, default=1)
+    price_cents = Column(Integer, nullable=False, default=0)       # цена за единицу в копейках
+    agent_fee_cents = Column(Integer, nullable=False, default=0)   # агентское вознаграждение по позиции
+
+    order = relationship("Order", back_populates="items")
+    product = relationship("Product")
+
+    def __repr__(self):
+        return f"<OrderItem order_id={self.order_id} product_id={self.product_id} qty={self.quantity}>"
+
 class Admin(Base):
     __tablename__ = "admins"
 
@@ -1,9 +1,15 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, conint, root_validator
+from typing import List, Optional
 
-class CreateOrderIn(BaseModel):
+class OrderItemIn(BaseModel):
     product_id: int
-    quantity: int = 1
+    quantity: conint(ge=1) = 1
+
+class CreateOrderIn(BaseModel):
+    # одиночный товар (старые ссылки /pay/{id}) или корзина items
+    product_id: Optional[int] = None
+    quantity: conint(ge=1) = 1
+    items: Optional[List[OrderItemIn]] = None
     fullname: str
     phone: str
     email: EmailStr
@@ -11,6 +17,18 @@ class CreateOrderIn(BaseModel):
     address: str
     comment: Optional[str] = None
 
+    @root_validator(skip_on_failure=True)
+    def _product_or_items(cls, values):
+        if not values.get("items") and values.get("product_id") is None:
+            raise ValueError("product_id or items is required")
+        return values
+
+    def cart_items(self) -> List[OrderItemIn]:
+        """Позиции заказа: корзина или один товар из product_id/quantity."""
+        if self.items:
+            return self.items
+        return [OrderItemIn(product_id=self.product_id, quantity=self.quantity)]
+
 class CreateOrderOut(BaseModel):
     order_id: str
     confirmation_url: str
@@ -1,5 +1,6 @@
 import requests
 import hashlib
+import re
 from .config import settings
 import logging
 import json
@@ -28,11 +29,47 @@ def _sha256_hex(s: str) -> str:
 # ==============================
 # Инициализация платежа Init
 # ==============================
-def create_tinkoff_payment(amount_cents: int, order_id: str, email: str, phone: str):
+def _normalize_phone(phone: str):
+    """Телефон в формате чека +7XXXXXXXXXX или None, если номер не распознан."""
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) == 11 and digits[0] in "78":
+        digits = digits[1:]
+    if len(digits) != 10:
+        return None
+    return "+7" + digits
+
+def _build_receipt(receipt_items, email: str, phone: str) -> dict:
+    """
+    Чек для Init. receipt_items: список dict(name, price_cents, quantity).
+    Receipt — вложенный объект, в подпись Token не входит.
+    Phone кладём только нормализованным, иначе Tinkoff отклонит Init — хватает Email.
+    """
+    receipt = {
+        "Email": email,
+        "Taxation": settings.TINKOFF_TAXATION,
+        "Items": [
+            {
+                "Name": item["name"][:128],
+                "Price": int(item["price_cents"]),
+                "Quantity": item["quantity"],
+                "Amount": int(item["price_cents"]) * item["quantity"],
+                "Tax": settings.TINKOFF_TAX,
+            }
+            for item in receipt_items
+        ],
+    }
+    receipt_phone = _normalize_phone(phone)
+    if receipt_phone:
+        receipt["Phone"] = receipt_phone
+    return receipt
+
+def create_tinkoff_payment(amount_cents: int, order_id: str, email: str, phone: str, receipt_items=None):
     """
     amount_cents: сумма в копейках (int, например 1000 => 10.00 руб)
     order_id: ваш OrderId (строка)
     email, phone: данные покупателя
+    receipt_items: позиции чека (вся корзина одним Init); сумма Amount позиций должна совпадать с amount_cents.
+    Receipt отправляется только при заданном TINKOFF_TAXATION — СНО не угадываем.
     """
     terminal_key = settings.TINKOFF_TERMINAL_KEY
     secret_key = settings.TINKOFF_PASSWORD  # SecretKey / Password в терминах Tinkoff
@@ -55,6 +92,8 @@ def create_tinkoff_payment(amount_cents: int, order_id: str, email: str, phone:
         "PayType": "O",
         "Recurrent": "N",
     }
+    if receipt_items and settings.TINKOFF_TAXATION:
+        payload["Receipt"] = _build_receipt(receipt_items, email, phone)
 
     logger.error(payload)
 
@@ -0,0 +1,18 @@
+# Накладные расходы админской авторизации на один запрос:
+# проверка HMAC-токена + права из кэша (без обращения к БД).
+# Запуск: python bench_admin_auth.py
+import timeit
+from app.auth import create_admin_token, require_admin, _permissions_cache
+from app.config import settings
+import time
+
+N = 100_000
+TELEGRAM_ID = 1
+
+# кладём права в кэш напрямую, чтобы мерить только горячий путь
+_permissions_cache[TELEGRAM_ID] = (frozenset({"products"}), time.monotonic() + 3600)
+dependency = require_admin("products")
+header = f"Bearer {create_admin_token(TELEGRAM_ID)}"
+
+total = timeit.timeit(lambda: dependency(authorization=header), number=N)
+print(f"require_admin: {total / N * 1e6:.2f} µs/request ({N} runs, cache TTL {settings.ADMIN_PERMISSIONS_CACHE_TTL}s)")
@@ -0,0 +1,25 @@
+import os
+import tempfile
+
+# Settings() читается при импорте app.*, поэтому окружение задаём до импортов в тестах
+_tmp_dir = tempfile.mkdtemp(prefix="buyer_bot_tests_")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_tmp_dir, 'primary.db')}",
+    DATABASE_REPLICA_URLS="",
+)
+for key, value in {
+    "ADMIN_CHAT_ID": "1",
+    "ADMIN_TOKEN_SECRET": "test-secret-0123456789abcdef0123456789abcdef",
+    "TELEGRAM_BOT_TOKEN": "test",
+    "BUYER_BOT_TOKEN": "test",
+    "TINKOFF_TERMINAL_KEY": "test",
+    "TINKOFF_PASSWORD": "test",
+    "TINKOFF_API_URL": "https://example.invalid",
+    "DADATA_API_KEY": "test",
+    "BASE_URL": "http://testserver",
+    "SMTP_HOST": "localhost",
+    "SMTP_USER": "test",
+    "SMTP_PASSWORD": "test",
+    "FRONTEND_RETURN_URL": "http://testserver/pay/return",
+}.items():
+    os.environ.setdefault(key, value)
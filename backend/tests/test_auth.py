@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import auth
+from app.config import Settings
+from app.models import Admin, Base
+
+
+@pytest.fixture
+def admins(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'admins.db'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.add_all([Admin(telegram_id=1, permissions="products"), Admin(telegram_id=2, permissions="reports")])
+    session.commit()
+    session.close()
+
+    monkeypatch.setattr(auth, "SessionLocal", Session)
+    auth.invalidate_admin_permissions()
+    yield Session
+    auth.invalidate_admin_permissions()
+
+
+def _call(permission, header):
+    return auth.require_admin(permission)(authorization=header)
+
+
+def test_valid_token_with_permission(admins):
+    assert _call("products", f"Bearer {auth.create_admin_token(1)}") == 1
+
+
+@pytest.mark.parametrize("header", [
+    None,
+    "Bearer garbage",
+    "Bearer 1.9999999999.bad",
+    "Bearer 1.9999999999.é",
+    "Basic 1.9999999999.bad",
+])
+def test_invalid_token_is_401(admins, header):
+    with pytest.raises(HTTPException) as exc:
+        _call("products", header)
+    assert exc.value.status_code == 401
+
+
+def test_expired_token_is_401(admins):
+    with pytest.raises(HTTPException) as exc:
+        _call("products", f"Bearer {auth.create_admin_token(1, ttl=-1)}")
+    assert exc.value.status_code == 401
+
+
+def test_token_longer_than_ttl_is_401(admins):
+    ttl = auth.settings.ADMIN_TOKEN_TTL_SECONDS
+    assert _call("products", f"Bearer {auth.create_admin_token(1, ttl=ttl + 10)}") == 1  # в пределах clock skew
+    with pytest.raises(HTTPException) as exc:
+        _call("products", f"Bearer {auth.create_admin_token(1, ttl=10 * 365 * 24 * 3600)}")
+    assert exc.value.status_code == 401
+
+
+def test_zero_ttl_is_not_replaced_by_default(admins, monkeypatch):
+    monkeypatch.setattr(auth.time, "time", lambda: 1000.0)
+    assert auth.create_admin_token(1, ttl=0).startswith("1.1000.")
+
+
+@pytest.mark.parametrize("telegram_id", [2, 3])
+def test_missing_permission_or_admin_is_403(admins, telegram_id):
+    with pytest.raises(HTTPException) as exc:
+        _call("products", f"Bearer {auth.create_admin_token(telegram_id)}")
+    assert exc.value.status_code == 403
+
+
+def test_permissions_are_cached_until_invalidated(admins):
+    assert auth.get_admin_permissions(2) == {"reports"}
+    session = admins()
+    session.query(Admin).filter(Admin.telegram_id == 2).update({"permissions": "*"})
+    session.commit()
+    session.close()
+
+    assert auth.get_admin_permissions(2) == {"reports"}
+    auth.invalidate_admin_permissions(2)
+    assert auth.get_admin_permissions(2) == {"*"}
+
+
+@pytest.mark.parametrize("invalidate_all", [False, True])
+def test_invalidation_during_load_is_not_overwritten(admins, monkeypatch, invalidate_all):
+    load = auth._load_permissions
+
+    def racing_load(telegram_id):
+        permissions = load(telegram_id)
+        auth.invalidate_admin_permissions(None if invalidate_all else telegram_id)
+        return permissions
+
+    monkeypatch.setattr(auth, "_load_permissions", racing_load)
+    auth.get_admin_permissions(1)
+    assert 1 not in auth._permissions_cache
+
+
+def test_ensure_root_admin_seeds_once(admins):
+    session = admins()
+    auth.ensure_root_admin(session, 42)
+    auth.ensure_root_admin(session, 1)
+    session.close()
+
+    assert auth.get_admin_permissions(42) == {"*"}
+    assert auth.get_admin_permissions(1) == {"products"}
+
+
+def test_ensure_root_admin_survives_concurrent_insert(admins, monkeypatch):
+    other_worker, session = admins(), admins()
+    other_worker.add(Admin(telegram_id=42, permissions="*"))
+    other_worker.commit()
+    other_worker.close()
+
+    # проверка существования прошла до вставки другого воркера
+    monkeypatch.setattr(session, "query", lambda *a: SimpleNamespace(filter=lambda *a: SimpleNamespace(first=lambda: None)))
+    auth.ensure_root_admin(session, 42)
+    session.close()
+
+    assert auth.get_admin_permissions(42) == {"*"}
+
+
+def test_short_secret_is_rejected(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN_SECRET", "short")
+    with pytest.raises(ValidationError):
+        Settings(_env_file=None)
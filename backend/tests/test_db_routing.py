@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import db
+from app.models import Base, Product
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """Primary + две sqlite-реплики; в primary и первой реплике есть товар id=1, во второй — пусто."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}", future=True)
+    router = db.ReplicaRouter(
+        [f"sqlite:///{tmp_path / 'replica1.db'}", f"sqlite:///{tmp_path / 'replica2.db'}"],
+        retry_after=30,
+    )
+    for bind in [primary, *router.engines]:
+        Base.metadata.create_all(bind=bind)
+    for bind in [primary, router.engines[0]]:
+        session = sessionmaker(bind=bind)()
+        session.add(Product(id=1, title="Товар", base_price_cents=1000))
+        session.commit()
+        session.close()
+
+    monkeypatch.setattr(db, "SessionLocal", sessionmaker(bind=primary))
+    monkeypatch.setattr(db, "replica_router", router)
+    return primary, router
+
+
+def _bound_engine(session):
+    return session.get_bind()
+
+
+def _get_product(session):
+    return session.query(Product).filter(Product.id == 1).first()
+
+
+def test_round_robin_over_replicas(databases):
+    _, router = databases
+    picked = [router.pick() for _ in range(4)]
+    assert picked == [router.engines[0], router.engines[1], router.engines[0], router.engines[1]]
+
+
+def test_mark_down_skips_replica_until_retry_after(databases, monkeypatch):
+    _, router = databases
+    now = [1000.0]
+    monkeypatch.setattr(db.time, "monotonic", lambda: now[0])
+
+    router.mark_down(router.engines[1])
+    assert [router.pick() for _ in range(3)] == [router.engines[0]] * 3
+
+    now[0] += router.retry_after
+    assert {router.pick() for _ in range(2)} == set(router.engines)
+
+
+def test_no_replicas_alive_falls_back_to_primary(databases):
+    primary, router = databases
+    for replica in router.engines:
+        router.mark_down(replica)
+
+    assert router.pick() is None
+    assert db.run_read(_bound_engine) is primary
+
+
+def test_operational_error_marks_replica_down_and_reads_primary(databases, monkeypatch):
+    broken = db.ReplicaRouter(["sqlite:////nonexistent/dir/replica.db"])
+    monkeypatch.setattr(db, "replica_router", broken)
+
+    assert db.run_read(_get_product).id == 1
+    assert broken.pick() is None
+
+
+def test_reads_go_to_replica(databases):
+    _, router = databases
+    assert db.run_read(_bound_engine) is router.engines[0]
+    assert db.run_read(_bound_engine) is router.engines[1]
+
+
+def test_fresh_on_miss_rereads_from_primary(databases):
+    _, router = databases
+    router.pick()  # следующей будет вторая реплика, где товара ещё нет
+
+    assert db.run_read(_get_product, fresh_on_miss=True).id == 1
+
+
+def test_miss_without_fresh_on_miss_returns_replica_result(databases):
+    _, router = databases
+    router.pick()
+
+    assert db.run_read(_get_product) is None
+
+
+def test_connect_timeout_only_for_postgresql():
+    assert db._connect_args("postgresql://u:p@replica/db", 3) == {"connect_timeout": 3}
+    assert db._connect_args("sqlite:///replica.db", 3) == {}
+
+
+def test_primary_flag_bypasses_replicas(databases):
+    primary, router = databases
+    assert db.run_read(_bound_engine, primary=True) is primary
+    assert router.pick() is router.engines[0]  # round-robin не сдвинулся
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import ProductNotFound, build_order_items, receipt_items
+from app.models import Base, Order, Product
+from app import tinkoff_client
+from app.tinkoff_client import _build_receipt, _normalize_phone
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'orders.db'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Product(id=1, title="Духи", base_price_cents=1000, agent_percent=10),
+        Product(id=2, title="Крем", base_price_cents=333, agent_percent=7),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("8 (999) 123-45-67", "+79991234567"),
+    ("+7 (999) 123 4567", "+79991234567"),
+    ("9991234567", "+79991234567"),
+    ("123", None),
+    ("", None),
+])
+def test_normalize_phone(raw, expected):
+    assert _normalize_phone(raw) == expected
+
+
+def test_cart_receipt_matches_order_total(session):
+    cart = [SimpleNamespace(product_id=1, quantity=2), SimpleNamespace(product_id=2, quantity=3)]
+    order_items, base_amount, agent_fee = build_order_items(session, cart)
+    order = Order(
+        order_id_str="20260101_001",
+        product_id=1,
+        quantity=5,
+        total_amount_cents=base_amount + agent_fee,
+        agent_fee_cents=agent_fee,
+        items=order_items,
+    )
+
+    receipt = _build_receipt(receipt_items(order), "buyer@example.com", "8 (999) 123-45-67")
+
+    assert (base_amount, agent_fee) == (2999, 200 + 69)
+    assert sum(item["Amount"] for item in receipt["Items"]) == order.total_amount_cents
+    assert receipt["Phone"] == "+79991234567"
+
+
+def test_receipt_omits_unparsable_phone():
+    receipt = _build_receipt([{"name": "Духи", "price_cents": 1000, "quantity": 1}], "buyer@example.com", "n/a")
+    assert "Phone" not in receipt
+
+
+def test_unknown_product_raises(session):
+    with pytest.raises(ProductNotFound):
+        build_order_items(session, [SimpleNamespace(product_id=1, quantity=1), SimpleNamespace(product_id=99, quantity=1)])
+
+
+class _InitResponse:
+    text = ""
+
+    def json(self):
+        return {"Success": True, "PaymentURL": "https://pay.example/1", "PaymentId": 1}
+
+
+@pytest.mark.parametrize("taxation, has_receipt", [(None, False), ("usn_income", True)])
+def test_receipt_sent_only_with_configured_taxation(monkeypatch, taxation, has_receipt):
+    sent = {}
+    monkeypatch.setattr(tinkoff_client.settings, "TINKOFF_TAXATION", taxation)
+    monkeypatch.setattr(tinkoff_client.requests, "post", lambda url, json, timeout: sent.update(json) or _InitResponse())
+
+    tinkoff_client.create_tinkoff_payment(
+        1000, "20260101_001", "buyer@example.com", "", receipt_items=[{"name": "Духи", "price_cents": 1000, "quantity": 1}]
+    )
+
+    assert ("Receipt" in sent) == has_receipt
+
+
+def test_only_missing_product_maps_to_404(monkeypatch):
+    from app import main
+
+    def init_failed(session, payload):
+        raise ValueError("Expecting value: line 1 column 1 (char 0)")  # как requests JSONDecodeError на 502
+
+    monkeypatch.setattr(main, "create_order_and_payment", init_failed)
+    with pytest.raises(ValueError):
+        main.api_create_order(SimpleNamespace())
+
+    def not_found(session, payload):
+        raise ProductNotFound("Product not found")
+
+    monkeypatch.setattr(main, "create_order_and_payment", not_found)
+    with pytest.raises(HTTPException) as exc:
+        main.api_create_order(SimpleNamespace())
+    assert exc.value.status_code == 404
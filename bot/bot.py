@@ -1,4 +1,7 @@
 import os
+import hmac
+import time
+import hashlib
 import logging
 import asyncio
 import requests
@@ -18,12 +21,26 @@ load_dotenv()
 TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 ADMIN_CHAT_ID = int(os.getenv("ADMIN_CHAT_ID", "0"))
 BACKEND_URL = "http://127.0.0.1:8000"
+ADMIN_TOKEN_SECRET = os.getenv("ADMIN_TOKEN_SECRET")
+ADMIN_TOKEN_TTL_SECONDS = int(os.getenv("ADMIN_TOKEN_TTL_SECONDS", "300"))  # та же переменная, что у backend
+if not ADMIN_TOKEN_SECRET or len(ADMIN_TOKEN_SECRET) < 32:
+    raise RuntimeError("ADMIN_TOKEN_SECRET is not set or shorter than 32 characters")
 
 logging.basicConfig(level=logging.INFO)
 bot = Bot(token=TOKEN, parse_mode="HTML")
 dp = Dispatcher()
 
 
+# ==============================
+# Админский токен для backend
+# ==============================
+def admin_headers(telegram_id: int) -> dict:
+    """Короткоживущий HMAC-токен "<telegram_id>.<expires_ts>.<sig>" (проверяется в backend/app/auth.py)."""
+    message = f"{telegram_id}.{int(time.time()) + ADMIN_TOKEN_TTL_SECONDS}"
+    signature = hmac.new(ADMIN_TOKEN_SECRET.encode("utf-8"), message.encode("utf-8"), hashlib.sha256).hexdigest()
+    return {"Authorization": f"Bearer {message}.{signature}"}
+
+
 # ==============================
 # FSM
 # ==============================
@@ -146,8 +163,12 @@ async def step_confirm(call: types.CallbackQuery, state: FSMContext):
             "title": data["title"],
             "base_price": data["price"],
             "percent": data["percent"]
-        }
+        },
+        headers=admin_headers(call.from_user.id)
     )
+    if resp.status_code in (401, 403):
+        await state.clear()
+        return await call.message.edit_text("⛔ Нет прав на создание ссылок.")
 
     product_id = resp.json()["product_id"]
 